@@ -15,7 +15,7 @@ from src.load_env import load_env_file
 from src.fred import fetch_risk_free_rate
 from src.schwab_manager import SchwabManager
 from src.helpers import calculate_time_to_wait_for_market_open, is_nyse_open, precompile_numba_functions, should_wait_for_market_open
-from src.models import barone_adesi_whaley_american_option_price, calculate_implied_volatility_baw
+from src.models import barone_adesi_whaley_american_option_price, calculate_implied_volatilities_baw
 from src.interpolations import fit_model, rbf_model, rfv_model
 
 precompile_numba_functions()
@@ -49,44 +49,43 @@ async def handle_trades(ticker, option_type, q, min_overpriced, min_oi, trade_st
     if config["DRY_RUN"] != True:
         await manager.cancel_existing_orders(ticker, from_entered_datetime, to_entered_datetime)
 
-    if trade_state in {TradeState.PENDING_SELL, TradeState.PENDING_BUY, TradeState.IN_POSITION}:
-        streamers_tickers, options, total_shares = await manager.get_account_positions(ticker)
+    # Our working orders must be gone before the chain is priced, so the fetch only overlaps the hedge.
+    chain_task = asyncio.create_task(manager.get_option_chain_data(ticker, option_date, option_type))
 
-        if trade_state in {TradeState.PENDING_SELL, TradeState.PENDING_BUY}:
-            trade_state = TradeState.IN_POSITION if len(streamers_tickers) > 0 else TradeState.NOT_IN_POSITION
+    try:
+        if trade_state in {TradeState.PENDING_SELL, TradeState.PENDING_BUY, TradeState.IN_POSITION}:
+            streamers_tickers, options, total_shares = await manager.get_account_positions(ticker)
+
+            if trade_state in {TradeState.PENDING_SELL, TradeState.PENDING_BUY}:
+                trade_state = TradeState.IN_POSITION if len(streamers_tickers) > 0 else TradeState.NOT_IN_POSITION
  
-        await manager.handle_delta_adjustments(ticker, streamers_tickers, expiration_time, options, total_shares, r, q)
+            await manager.handle_delta_adjustments(ticker, streamers_tickers, expiration_time, options, total_shares, r, q)
+
+        chain_arrays, S = await chain_task
+    finally:
+        if not chain_task.done():
+            chain_task.cancel()
+        elif not chain_task.cancelled():
+            # Retrieve a failed fetch's exception so an earlier error does not leave it unreported.
+            chain_task.exception()
 
-    quote_data, S = await manager.get_option_chain_data(ticker, option_date, option_type)
+    x, y_bid, y_ask, y_mid, open_interest = chain_arrays.strikes, chain_arrays.bid, chain_arrays.ask, chain_arrays.mid, chain_arrays.open_interest
 
-    sorted_data = dict(sorted(quote_data.items()))
-    filtered_strikes = filter_strikes(np.array(list(sorted_data.keys())), S, num_stdev=1.25)
-    sorted_data = filter_by_bid_price(sorted_data, filtered_strikes)
+    filtered_strikes = filter_strikes(x, S, num_stdev=1.25)
+    mask = filter_by_bid_price(x, y_bid, filtered_strikes)
+    x, y_bid, y_ask, y_mid, open_interest = x[mask], y_bid[mask], y_ask[mask], y_mid[mask], open_interest[mask]
 
     current_time = datetime.now()
     T = (expiration_time - current_time).total_seconds() / (365 * 24 * 3600)
 
-    for K, prices in sorted_data.items():
-        sorted_data[K] = {
-            "bid": prices["bid"],
-            "ask": prices["ask"],
-            "mid": prices["mid"],
-            "open_interest": prices["open_interest"],
-            "mid_IV": calculate_implied_volatility_baw(prices["mid"], S, K, r, T, q=q, option_type=option_type),
-            "ask_IV": calculate_implied_volatility_baw(prices["ask"], S, K, r, T, q=q, option_type=option_type),
-            "bid_IV": calculate_implied_volatility_baw(prices["bid"], S, K, r, T, q=q, option_type=option_type)
-        }
-
-    sorted_data = filter_by_mid_iv(sorted_data)
-
-    x = np.array(list(sorted_data.keys())) 
-    y_bid_iv = np.array([prices['bid_IV'] for prices in sorted_data.values()])
-    y_ask_iv = np.array([prices['ask_IV'] for prices in sorted_data.values()])
-    y_mid_iv = np.array([prices['mid_IV'] for prices in sorted_data.values()])
-    open_interest = np.array([prices['open_interest'] for prices in sorted_data.values()])
-    y_bid = np.array([prices['bid'] for prices in sorted_data.values()])
-    y_ask = np.array([prices['ask'] for prices in sorted_data.values()])
-    y_mid = np.array([prices['mid'] for prices in sorted_data.values()])
+    is_call = np.full(len(x), option_type == 'calls')
+    y_mid_iv = calculate_implied_volatilities_baw(y_mid, S, x, r, T, q, is_call)
+    y_ask_iv = calculate_implied_volatilities_baw(y_ask, S, x, r, T, q, is_call)
+    y_bid_iv = calculate_implied_volatilities_baw(y_bid, S, x, r, T, q, is_call)
+
+    mask = filter_by_mid_iv(y_mid_iv)
+    x, y_bid, y_ask, y_mid, open_interest = x[mask], y_bid[mask], y_ask[mask], y_mid[mask], open_interest[mask]
+    y_bid_iv, y_ask_iv, y_mid_iv = y_bid_iv[mask], y_ask_iv[mask], y_mid_iv[mask]
 
     if len(x) >= 20:
         scaler = MinMaxScaler()
@@ -94,7 +93,7 @@ async def handle_trades(ticker, option_type, q, min_overpriced, min_oi, trade_st
         x_normalized = x_normalized + 0.5
 
         rbf_interpolator = rbf_model(np.log(x_normalized), y_mid_iv, epsilon=0.3)
-        rfv_params = fit_model(x_normalized, y_mid_iv, y_bid_iv, y_ask_iv, rfv_model)
+        rfv_params = fit_model(x_normalized, y_mid_iv, y_bid_iv, y_ask_iv)
 
         fine_x_normalized = np.linspace(np.min(x_normalized), np.max(x_normalized), 800)
         rbf_interpolated_y = rbf_interpolator(np.log(fine_x_normalized).reshape(-1, 1))
@@ -147,70 +146,75 @@ async def handle_trades(ticker, option_type, q, min_overpriced, min_oi, trade_st
 
     return trade_state
 
-async def main():
+async def initialize_stock_node(node):
     """
-    Main function to initialize the bot.
+    Fetches the dividend yield and option expiration for a stock and stores them on its node.
+
+    Args:
+        node (StockNode): Node of the stock to initialize.
     """
-    await manager.initialize()
+    q, date = await asyncio.gather(
+        manager.get_dividend_yield(node.ticker),
+        manager.get_option_expiration_date(node.ticker, node.date_index)
+    )
+    node.set_q(q)
 
-    if stocks_list.head is not None:
-        current_node = stocks_list.head
-        while True:
-            ticker = current_node.ticker
-            date_index = current_node.date_index
+    option_date = datetime.strptime(date, "%Y-%m-%d").date()
+    expiration_time = datetime.combine(datetime.strptime(date, '%Y-%m-%d'), datetime.min.time()) + timedelta(hours=16)
 
-            q = await manager.get_dividend_yield(ticker)
-            current_node.set_q(q)
+    node.set_option_date(option_date)
+    node.set_expiration_time(expiration_time)
 
-            date = await manager.get_option_expiration_date(ticker, date_index)
-            option_date = datetime.strptime(date, "%Y-%m-%d").date()
-            expiration_time = datetime.combine(datetime.strptime(date, '%Y-%m-%d'), datetime.min.time()) + timedelta(hours=16)
+    current_date = datetime.now().date()
+    from_entered_datetime = datetime.combine(current_date, datetime.min.time()).replace(
+        tzinfo=timezone(timedelta(hours=-5))
+    )
+    to_entered_datetime = datetime.combine(current_date, datetime.max.time()).replace(
+        tzinfo=timezone(timedelta(hours=-5))
+    )
 
-            current_node.set_option_date(option_date)
-            current_node.set_expiration_time(expiration_time)
+    node.set_from_entered_datetime(from_entered_datetime)
+    node.set_to_entered_datetime(to_entered_datetime)
 
-            current_date = datetime.now().date()
-            from_entered_datetime = datetime.combine(current_date, datetime.min.time()).replace(
-                tzinfo=timezone(timedelta(hours=-5))
-            )
-            to_entered_datetime = datetime.combine(current_date, datetime.max.time()).replace(
-                tzinfo=timezone(timedelta(hours=-5))
-            )
+async def main():
+    """
+    Main function to initialize the bot.
+    """
+    try:
+        await manager.initialize()
 
-            current_node.set_from_entered_datetime(from_entered_datetime)
-            current_node.set_to_entered_datetime(to_entered_datetime)
+        await asyncio.gather(*(initialize_stock_node(node) for node in stocks_list))
+        current_node = stocks_list.head
 
-            current_node = current_node.next
-            if current_node == stocks_list.head:
+        while True:
+            if (is_nyse_open() or config["DRY_RUN"]):
+                trade_state = await handle_trades(
+                    current_node.ticker,
+                    current_node.option_type,
+                    current_node.q,
+                    current_node.min_overpriced,
+                    current_node.min_oi,
+                    current_node.trade_state,
+                    current_node.option_date,
+                    current_node.expiration_time,
+                    current_node.from_entered_datetime,
+                    current_node.to_entered_datetime
+                )
+
+                current_node.set_trade_state(trade_state)
+                current_node = current_node.next
+            elif should_wait_for_market_open():
+                time_to_wait = calculate_time_to_wait_for_market_open()
+
+                logging.getLogger().custom(f"NYSE is closed. Waiting for {time_to_wait.total_seconds()} seconds until market opens.")
+                await asyncio.sleep(time_to_wait.total_seconds())
+            else:
+                logging.getLogger().custom("NYSE is closed now.")
                 break
 
-    while True:
-        if (is_nyse_open() or config["DRY_RUN"]):
-            trade_state = await handle_trades(
-                current_node.ticker,
-                current_node.option_type,
-                current_node.q,
-                current_node.min_overpriced,
-                current_node.min_oi,
-                current_node.trade_state,
-                current_node.option_date,
-                current_node.expiration_time,
-                current_node.from_entered_datetime,
-                current_node.to_entered_datetime
-            )
-
-            current_node.set_trade_state(trade_state)
-            current_node = current_node.next
-        elif should_wait_for_market_open():
-            time_to_wait = calculate_time_to_wait_for_market_open()
-
-            logging.getLogger().custom(f"NYSE is closed. Waiting for {time_to_wait.total_seconds()} seconds until market opens.")
-            await asyncio.sleep(time_to_wait.total_seconds())
-        else:
-            logging.getLogger().custom("NYSE is closed now.")
-            break
-
-        await asyncio.sleep(config["TIME_TO_REST"])
+            await asyncio.sleep(config["TIME_TO_REST"])
+    finally:
+        await manager.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,6 +1,28 @@
 import logging
-import httpx
 from schwab.auth import easy_client
+from schwab.client import Client
+
+logger = logging.getLogger(__name__)
+
+_ORDER_STATUS_WORKING = Client.Order.Status.WORKING
+_ACCOUNT_FIELDS_POSITIONS = (Client.Account.Fields.POSITIONS,)
+_CONTRACT_TYPE = {"calls": Client.Options.ContractType.CALL, "puts": Client.Options.ContractType.PUT}
+
+def _check_response(resp, message):
+    """
+    Check that a response carries a 2xx status code, logging it otherwise.
+
+    Args:
+        resp (httpx.Response): The response returned by the Schwab client.
+        message (str): Prefix of the error logged when the status is not 2xx.
+
+    Returns:
+        bool: True if the request succeeded, False otherwise.
+    """
+    if resp.is_success:
+        return True
+    logger.error("%s: Unexpected status code %s", message, resp.status_code)
+    return False
 
 class ClientManager:
     """
@@ -13,9 +35,9 @@ class ClientManager:
 
     Methods:
         authenticate_schwab_client(): Authenticates the Schwab client.
+        close(): Closes the HTTP session of the authenticated client.
         fetch_account_numbers(): Fetches the account numbers associated with the authenticated client.
         fetch_option_expiration_chain(ticker): Fetches the option expiration chain for the given ticker.
-        fetch_quote(ticker): Fetches a quote for a specific ticker.
         fetch_quotes(streamers_tickers): Fetches quotes for a list of option tickers.
         fetch_orders_for_account(account_hash, from_date, to_date): Fetches orders for the specified account within the date range.
         fetch_account_data(account_hash): Fetches the account data, including positions, for a specified account.
@@ -49,9 +71,26 @@ class ClientManager:
                 callback_url=self.config["SCHWAB_CALLBACK_URL"],
                 asyncio=True
             )
-            logging.getLogger().custom("Login successful.")
+            logger.custom("Login successful.")
+        except Exception as e:
+            logger.error("Login Failed: An error occurred: %s", e)
+            self.client = None
+
+    async def close(self):
+        """
+        Close the HTTP session of the authenticated client and release its pooled connections.
+
+        Returns:
+            None
+        """
+        if self.client is None:
+            return
+
+        try:
+            await self.client.close_async_session()
         except Exception as e:
-            logging.error(f"Login Failed: An error occurred: {str(e)}")
+            logger.error("Failed to close client session: %s", e)
+        finally:
             self.client = None
 
     async def fetch_account_numbers(self):
@@ -63,10 +102,11 @@ class ClientManager:
         """
         try:
             resp = await self.client.get_account_numbers()
-            assert resp.status_code == httpx.codes.OK
+            if not _check_response(resp, "Failed to fetch account numbers"):
+                return None
             return resp.json()
         except Exception as e:
-            logging.error(f"Failed to fetch account numbers: {str(e)}")
+            logger.error("Failed to fetch account numbers: %s", e)
             return None
 
     async def fetch_option_expiration_chain(self, ticker):
@@ -81,28 +121,11 @@ class ClientManager:
         """
         try:
             resp = await self.client.get_option_expiration_chain(ticker)
-            assert resp.status_code == httpx.codes.OK
-            return resp.json()
-        except Exception as e:
-            logging.error(f"Failed to fetch expiration chain: {str(e)}")
-            return None
-
-    async def fetch_quote(self, ticker):
-        """
-        Fetch the quote for the specified ticker.
-
-        Args:
-            ticker (str): The ticker symbol of the underlying security.
-
-        Returns:
-            dict: The quote data if successful, None otherwise.
-        """
-        try:
-            resp = await self.client.get_quote(ticker)
-            assert resp.status_code == httpx.codes.OK
+            if not _check_response(resp, "Failed to fetch expiration chain"):
+                return None
             return resp.json()
         except Exception as e:
-            logging.error(f"Failed to fetch quote: {str(e)}")
+            logger.error("Failed to fetch expiration chain: %s", e)
             return None
 
     async def fetch_quotes(self, streamers_tickers):
@@ -117,10 +140,11 @@ class ClientManager:
         """
         try:
             resp = await self.client.get_quotes(streamers_tickers)
-            assert resp.status_code == httpx.codes.OK
+            if not _check_response(resp, "Failed to fetch quotes"):
+                return None
             return resp.json()
         except Exception as e:
-            logging.error(f"Failed to fetch quotes: {str(e)}")
+            logger.error("Failed to fetch quotes: %s", e)
             return None
 
     async def fetch_orders_for_account(self, account_hash, from_date, to_date):
@@ -140,12 +164,13 @@ class ClientManager:
                 account_hash, 
                 from_entered_datetime=from_date, 
                 to_entered_datetime=to_date, 
-                status=self.client.Order.Status.WORKING
+                status=_ORDER_STATUS_WORKING
             )
-            assert resp.status_code == httpx.codes.OK
+            if not _check_response(resp, "Error fetching account orders"):
+                return None
             return resp.json()
         except Exception as e:
-            logging.error(f"Error fetching account orders: {str(e)}")
+            logger.error("Error fetching account orders: %s", e)
             return None
 
     async def fetch_account_data(self, account_hash):
@@ -159,11 +184,12 @@ class ClientManager:
             dict: The account data if successful, None otherwise.
         """
         try:
-            resp = await self.client.get_account(account_hash, fields=[self.client.Account.Fields.POSITIONS])
-            assert resp.status_code == httpx.codes.OK
+            resp = await self.client.get_account(account_hash, fields=_ACCOUNT_FIELDS_POSITIONS)
+            if not _check_response(resp, "Error fetching account data"):
+                return None
             return resp.json()
         except Exception as e:
-            logging.error(f"Error fetching account data: {str(e)}")
+            logger.error("Error fetching account data: %s", e)
             return None
 
     async def fetch_option_chain(self, ticker, option_date, option_type):
@@ -183,12 +209,13 @@ class ClientManager:
                 ticker, 
                 from_date=option_date, 
                 to_date=option_date, 
-                contract_type=self.client.Options.ContractType.CALL if option_type == "calls" else self.client.Options.ContractType.PUT
+                contract_type=_CONTRACT_TYPE[option_type]
             )
-            assert respChain.status_code == httpx.codes.OK
+            if not _check_response(respChain, "Failed to fetch option chain"):
+                return None
             return respChain.json()
         except Exception as e:
-            logging.error(f"Failed to fetch option chain: {str(e)}")
+            logger.error("Failed to fetch option chain: %s", e)
             return None
 
     async def place_order(self, account_hash, order):
@@ -204,8 +231,7 @@ class ClientManager:
         """
         try:
             resp = await self.client.place_order(account_hash, order)
-            assert resp.status_code == httpx.codes.OK
-            return True
+            return _check_response(resp, "Failed to place order")
         except Exception as e:
             return False
 
@@ -222,8 +248,7 @@ class ClientManager:
         """
         try:
             resp = await self.client.cancel_order(order_id, account_hash)
-            assert resp.status_code == httpx.codes.OK
-            return True
+            return _check_response(resp, f"Error cancelling order {order_id}")
         except Exception as e:
-            logging.error(f"Error cancelling order {order_id}: {str(e)}")
+            logger.error("Error cancelling order %s: %s", order_id, e)
             return False
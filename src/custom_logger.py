@@ -10,8 +10,10 @@ def custom(self, message, *args, **kwargs):
 logging.Logger.custom = custom
 
 class CustomFilter(logging.Filter):
+    _ALLOWED_LEVELS = frozenset({logging.ERROR, CUSTOM_LEVEL_NUM})
+
     def filter(self, record):
-        return record.levelno in (logging.ERROR, CUSTOM_LEVEL_NUM)
+        return record.levelno in self._ALLOWED_LEVELS
 
 def init_custom_logger(log_filename="trade_bot.log"):
     """
@@ -33,4 +35,6 @@ def init_custom_logger(log_filename="trade_bot.log"):
     if logger.hasHandlers():
         logger.handlers.clear()
 
+    logger.filters.clear()
+    logger.addFilter(CustomFilter())
     logger.addHandler(file_handler)
@@ -1,51 +1,71 @@
 import numpy as np
 from numba import njit
 
-@njit
-def filter_strikes(x, S, num_stdev=1.25, two_sigma_move=False):
+@njit(cache=True)
+def _strikes_within(x, lower_bound, upper_bound):
+    """
+    Slice the sorted strikes lying within [lower_bound, upper_bound].
+
+    Args:
+        x (np.ndarray): Array of strike prices, sorted in ascending order.
+        lower_bound (float): Smallest strike to keep.
+        upper_bound (float): Largest strike to keep.
+
+    Returns:
+        np.ndarray: View of x holding the strikes within the bounds.
+    """
+    lo = np.searchsorted(x, lower_bound, side='left')
+    hi = np.searchsorted(x, upper_bound, side='right')
+    return x[lo:hi]
+
+@njit(cache=True)
+def filter_strikes(x, S, num_stdev=1.25, two_sigma_move=False, stdev=None):
     """
     Filter strike prices around the underlying asset's price.
 
     Args:
-        x (array-like): Array of strike prices.
+        x (array-like): Array of strike prices, sorted in ascending order.
         S (float): Current underlying price.
         num_stdev (float, optional): Number of standard deviations for filtering. Defaults to 1.25.
         two_sigma_move (bool, optional): Adjust upper bound for a 2-sigma move. Defaults to False.
+        stdev (float, optional): Precomputed standard deviation of x. Computed from x when None. Defaults to None.
 
     Returns:
-        array-like: Filtered array of strike prices within the specified range.
+        array-like: View of x holding the strike prices within the specified range.
     """
-    stdev = np.std(x)
-    lower_bound = S - num_stdev * stdev
-    upper_bound = S + num_stdev * stdev
+    if stdev is None:
+        spread = np.std(x)
+    else:
+        spread = stdev
 
+    radius = num_stdev * spread
     if two_sigma_move:
-        upper_bound = S + 2 * stdev
-
-    return x[(x >= lower_bound) & (x <= upper_bound)]
+        return _strikes_within(x, S - radius, S + 2 * spread)
+    return _strikes_within(x, S - radius, S + radius)
 
-def filter_by_bid_price(sorted_data, filtered_strikes):
+def filter_by_bid_price(strikes, bids, filtered_strikes):
     """
-    Filter sorted strike data by ensuring strikes are in filtered_strikes and bid prices are not zero.
+    Build a mask keeping strikes that are in filtered_strikes and whose bid prices are not zero.
 
     Args:
-        sorted_data (dict): Dictionary containing strike prices and their corresponding price data.
+        strikes (np.ndarray): Array of strike prices.
+        bids (np.ndarray): Bid prices aligned with strikes.
         filtered_strikes (array-like): Array of filtered strike prices.
 
     Returns:
-        dict: Filtered dictionary containing only strikes in filtered_strikes with non-zero bid prices.
+        np.ndarray: Boolean mask aligned with strikes.
     """
-    return {strike: prices for strike, prices in sorted_data.items() if strike in filtered_strikes and prices['bid'] != 0.0}
+    return np.isin(strikes, filtered_strikes) & (bids != 0.0)
 
-def filter_by_mid_iv(sorted_data, min_mid_iv=0.005):
+def filter_by_mid_iv(mid_iv, min_mid_iv=0.005):
     """
-    Filter sorted strike data by ensuring mid IV is greater than a minimum threshold.
+    Build a mask keeping strikes whose mid IV is greater than a minimum threshold.
 
     Args:
-        sorted_data (dict): Dictionary containing strike prices and their corresponding price data.
+        mid_iv (np.ndarray): Mid implied volatilities aligned with the strikes.
         min_mid_iv (float, optional): Minimum threshold for mid implied volatility (mid_IV). Defaults to 0.005.
 
     Returns:
-        dict: Filtered dictionary containing only strikes where mid_IV is greater than the minimum threshold.
+        np.ndarray: Boolean mask aligned with mid_iv.
     """
-    return {strike: prices for strike, prices in sorted_data.items() if prices['mid_IV'] > min_mid_iv}
+    return mid_iv > min_mid_iv
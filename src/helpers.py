@@ -1,78 +1,143 @@
 import numpy as np
 from datetime import datetime, time, timedelta
+from time import monotonic
 
 from src.filters import filter_strikes
-from src.interpolations import objective_function, rfv_model
-from src.models import barone_adesi_whaley_american_option_price, calculate_delta, calculate_implied_volatility_baw
+from src.interpolations import fit_rfv_lm, objective_and_grad, pack_chain, rfv_model
+from src.models import barone_adesi_whaley_american_option_price, calculate_implied_volatilities_and_deltas_baw, calculate_implied_volatilities_baw
 
-def is_nyse_open():
+_MARKET_OPEN_TIME = time(9, 30)
+_MARKET_OPEN_SECONDS = 9 * 3600 + 30 * 60
+_MARKET_CLOSE_SECONDS = 15 * 3600 + 50 * 60
+
+class Clock:
+    """
+    Shared clock tick for the market-hours checks.
+
+    Reading the wall clock is cached for a short interval, so the status checks made during one
+    iteration of the trading loop all see the same timestamp.
+
+    Attributes:
+        ttl (float): Number of seconds a reading stays valid.
+    """
+
+    __slots__ = ("ttl", "_tick", "_now")
+
+    def __init__(self, ttl=0.05):
+        """
+        Initializes a Clock instance.
+
+        Args:
+            ttl (float, optional): Number of seconds a reading stays valid. Defaults to 0.05.
+        """
+        self.ttl = ttl
+        self._tick = float('-inf')
+        self._now = None
+
+    def now(self):
+        """
+        Returns the current local time, refreshed at most once per ttl.
+
+        Returns:
+            datetime: The cached current local time.
+        """
+        tick = monotonic()
+        if tick - self._tick >= self.ttl:
+            self._now = datetime.now()
+            self._tick = tick
+        return self._now
+
+_DEFAULT_CLOCK = Clock()
+
+def _seconds_of_day(now):
+    """
+    Number of seconds elapsed since midnight.
+
+    Args:
+        now (datetime): The time to convert.
+
+    Returns:
+        int: Seconds since midnight.
+    """
+    return now.hour * 3600 + now.minute * 60 + now.second
+
+def is_nyse_open(clock=_DEFAULT_CLOCK):
     """
     Check if the New York Stock Exchange (NYSE) is currently open.
     
     The NYSE operates Monday through Friday from 9:30 AM to 3:50 PM EST.
     This function checks if the current time falls within the trading hours 
     and excludes weekends (Saturday and Sunday).
+
+    Args:
+        clock (Clock, optional): Clock providing the current time. Defaults to the shared clock.
     
     Returns:
         bool: True if NYSE is currently open, False otherwise.
     """
-    now = datetime.now()
+    now = clock.now()
     if now.weekday() >= 5:
         return False
 
-    open_time = time(9, 30)
-    close_time = time(15, 50)
-
-    current_time = now.time()
-
-    return open_time <= current_time < close_time
+    return _MARKET_OPEN_SECONDS <= _seconds_of_day(now) < _MARKET_CLOSE_SECONDS
 
-def should_wait_for_market_open():
+def should_wait_for_market_open(clock=_DEFAULT_CLOCK):
     """
     Check if the current time is before the market opens on a weekday.
 
     This function determines if the current time is before 9:30 AM on a weekday 
     (Monday to Friday). If true, it indicates that the code should wait until the market opens.
 
+    Args:
+        clock (Clock, optional): Clock providing the current time. Defaults to the shared clock.
+
     Returns:
         bool: True if the current time is before 9:30 AM on a weekday, False otherwise.
     """
-    now = datetime.now()
-    if now.weekday() < 5 and now.time() < time(9, 30):
+    now = clock.now()
+    if now.weekday() < 5 and _seconds_of_day(now) < _MARKET_OPEN_SECONDS:
         return True
     return False
 
-def calculate_time_to_wait_for_market_open():
+def calculate_time_to_wait_for_market_open(clock=_DEFAULT_CLOCK):
     """
     Calculate the time to wait until the market opens at 9:30 AM on the current day.
 
     This function computes the time difference between the current time and 9:30 AM 
     on the current day, then adds an additional 15 seconds to the wait time.
 
+    Args:
+        clock (Clock, optional): Clock providing the current time. Defaults to the shared clock.
+
     Returns:
         timedelta: The time duration to wait until market opens, plus 15 seconds.
     """
-    market_open_time = datetime.combine(datetime.now().date(), time(9, 30))
-    time_to_wait = (market_open_time - datetime.now()) + timedelta(seconds=15)
+    now = clock.now()
+    market_open_time = datetime.combine(now.date(), _MARKET_OPEN_TIME)
+    time_to_wait = (market_open_time - now) + timedelta(seconds=15)
     return time_to_wait
 
 def precompile_numba_functions():
     """
     Precompile Numba functions to improve performance.
 
-    This method calls Numba-compiled functions with sample data to ensure they are precompiled,
-    reducing latency during actual execution.
+    This method calls Numba-compiled functions with sample data of the same dtypes and layouts used
+    in production (float64 strike and IV arrays), so no new specialization is compiled during trading.
     """
     barone_adesi_whaley_american_option_price(100.0, 100.0, 0.05, 0.01, 1.0, 0.2, option_type='calls')
-    calculate_implied_volatility_baw(0.1, 100.0, 100.0, 0.01, 0.5, option_type='calls')
-    calculate_delta(100.0, 100.0, 0.5, 0.01, 0.2, option_type='calls')
-    k = np.array([0.1])
-    rfv_model(k, [0.1, 0.2, 0.3, 0.4, 0.5])
-    y_mid = np.array([0.15, 0.18, 0.2, 0.22, 0.25])
-    y_bid = np.array([0.14, 0.17, 0.19, 0.21, 0.24])
-    y_ask = np.array([0.16, 0.19, 0.21, 0.23, 0.26])
-    params = [0.1, 0.2, 0.3, 0.4, 0.5]
-    objective_function(params, k, y_mid, y_bid, y_ask, rfv_model)
-    strikes = np.array([90, 95, 100, 105, 110])
+    batch_strikes = np.array([95.0, 100.0, 105.0])
+    is_call = np.array([True, False, True])
+    batch_prices = np.array([6.0, 2.5, 1.0])
+    calculate_implied_volatilities_baw(batch_prices, 100.0, batch_strikes, 0.01, 0.5, 0.0, is_call)
+    calculate_implied_volatilities_and_deltas_baw(batch_prices, 100.0, batch_strikes, 0.01, 0.5, 0.0, is_call)
+    k = np.linspace(-0.3, 0.3, 256)
+    params = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+    rfv_model(k, params)
+    y_mid = np.full(256, 0.2)
+    y_bid = y_mid - 0.01
+    y_ask = y_mid + 0.01
+    chain = pack_chain(k, y_mid, y_bid, y_ask)
+    objective_and_grad(params, chain)
+    fit_rfv_lm(k, y_mid, 1 / (y_ask - y_bid + 1e-8), params)
+    strikes = np.arange(50.0, 150.0, 2.5)
     filter_strikes(strikes, 100.0, num_stdev=1.25)
-    
\ No newline at end of file
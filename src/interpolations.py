@@ -1,27 +1,76 @@
+from functools import lru_cache
 import numpy as np
 from scipy.optimize import minimize
-from scipy.interpolate import RBFInterpolator
+from scipy.linalg import lu_factor, lu_solve
 from numba import njit
 
-@njit
+@njit(cache=True, fastmath=True)
+def rfv_eval_scalar(k, a, b, c, d, e):
+    """
+    Evaluate the RFV model at a single log-moneyness.
+
+    Args:
+        k (float): Log-moneyness of the option.
+        a, b, c, d, e (float): RFV model parameters.
+
+    Returns:
+        float: The RFV model value.
+    """
+    return (a + k*(b + k*c)) / (1 + k*(d + k*e))
+
+@njit('float64[::1](float64[::1], float64[::1])', cache=True, fastmath=True)
 def rfv_model(k, params):
     """
     RFV Model function.
 
     Args:
-        k (float or array-like): Log-moneyness of the option.
-        params (list): Parameters [a, b, c, d, e] for the RFV model.
+        k (np.ndarray): Log-moneyness of the options (C-contiguous float64).
+        params (np.ndarray): Parameters [a, b, c, d, e] for the RFV model (C-contiguous float64).
 
     Returns:
-        float or array-like: The RFV model value for the given log-moneyness.
+        np.ndarray: The RFV model values for the given log-moneyness.
     """
     a, b, c, d, e = params
-    return (a + b*k + c*k**2) / (1 + d*k + e*k**2)
+    out = np.empty_like(k)
+    for i in range(k.shape[0]):
+        out[i] = rfv_eval_scalar(k[i], a, b, c, d, e)
+    return out
+
+@lru_cache(maxsize=32)
+def _rbf_factorization(k_bytes, epsilon, smoothing):
+    """
+    Build and LU-factor the multiquadric RBF system for a set of knots.
+
+    The system matches the one solved by RBFInterpolator: the kernel -sqrt((epsilon * r)^2 + 1) with
+    smoothing on the diagonal, augmented with a constant polynomial term. It depends only on the knots,
+    so the factorization is cached and reused when only the values change.
+
+    Args:
+        k_bytes (bytes): Raw float64 buffer of the knots.
+        epsilon (float): Shape parameter of the kernel.
+        smoothing (float): Smoothing added to the kernel diagonal.
+
+    Returns:
+        tuple: Contains:
+            - np.ndarray: Copy of the knots scaled by epsilon.
+            - tuple: LU factorization of the augmented system from lu_factor.
+    """
+    scaled_k = np.frombuffer(k_bytes, dtype=np.float64) * epsilon
+    n = scaled_k.shape[0]
+    lhs = np.zeros((n + 1, n + 1))
+    lhs[:n, :n] = -np.sqrt((scaled_k[:, np.newaxis] - scaled_k[np.newaxis, :])**2 + 1)
+    lhs[:n, :n] += smoothing * np.eye(n)
+    lhs[:n, n] = 1.0
+    lhs[n, :n] = 1.0
+    return scaled_k, lu_factor(lhs)
 
 def rbf_model(k, y, epsilon=None):
     """
     RBF Interpolation model function.
 
+    Equivalent to a multiquadric RBFInterpolator, but the factorization of the kernel system is cached
+    per set of knots, so refitting the same strikes only costs a triangular solve.
+
     Args:
         k (array-like): Log-moneyness of the option.
         y (array-like): Implied volatilities corresponding to log-moneyness.
@@ -30,52 +79,266 @@ def rbf_model(k, y, epsilon=None):
     Returns:
         function: A callable function that interpolates implied volatilities for given log-moneyness.
     """
+    k = np.ascontiguousarray(k, dtype=np.float64)
     if epsilon is None:
         epsilon = np.mean(np.diff(np.sort(k)))
-    rbf = RBFInterpolator(k[:, np.newaxis], y, kernel='multiquadric', epsilon=epsilon, smoothing=0.000000000001)
+    scaled_k, factorization = _rbf_factorization(k.tobytes(), float(epsilon), 0.000000000001)
+    coeffs = lu_solve(factorization, np.append(y, 0.0))
+    weights = coeffs[:-1]
+    constant = coeffs[-1]
+
+    def rbf(x):
+        scaled_x = np.ravel(x) * epsilon
+        kernel = -np.sqrt((scaled_x[:, np.newaxis] - scaled_k[np.newaxis, :])**2 + 1)
+        return kernel @ weights + constant
+
     return rbf
 
-@njit
-def objective_function(params, k, y_mid, y_bid, y_ask, model):
+def pack_chain(k, y_mid, y_bid, y_ask):
     """
-    Objective function to minimize during model fitting using WLS method.
+    Pack the per-option fitting inputs into one contiguous array.
 
     Args:
-        params (list): Model parameters.
         k (array-like): Log-moneyness of the options.
         y_mid (array-like): Mid prices of the options.
         y_bid (array-like): Bid prices of the options.
         y_ask (array-like): Ask prices of the options.
-        model (function): The volatility model to be fitted.
 
     Returns:
-        float: The calculated objective value to be minimized.
+        np.ndarray: C-contiguous float64 array of shape (N, 4) with columns [k, y_mid, y_bid, y_ask].
     """
-    spread = y_ask - y_bid
+    return np.ascontiguousarray(np.column_stack((k, y_mid, y_bid, y_ask)), dtype=np.float64)
+
+@njit(cache=True, fastmath=True)
+def objective_and_grad(params, chain):
+    """
+    WLS objective for the RFV model together with its analytic gradient, computed in a single pass.
+
+    Args:
+        params (np.ndarray): RFV model parameters [a, b, c, d, e] (float64).
+        chain (np.ndarray): Packed options from pack_chain, with columns [k, y_mid, y_bid, y_ask].
+
+    Returns:
+        tuple: Contains:
+            - float: The objective value.
+            - np.ndarray: Gradient of the objective with respect to [a, b, c, d, e].
+    """
+    a, b, c, d, e = params
     epsilon = 1e-8
-    weights = 1 / (spread + epsilon)
-    residuals = model(k, params) - y_mid
-    weighted_residuals = weights * residuals ** 2
-    return np.sum(weighted_residuals)
+    total = 0.0
+    grad = np.zeros(5)
+    for i in range(chain.shape[0]):
+        ki = chain[i, 0]
+        ki2 = ki * ki
+        den = 1 + d*ki + e*ki2
+        model_value = (a + b*ki + c*ki2) / den
+        residual = model_value - chain[i, 1]
+        weight = 1 / (chain[i, 3] - chain[i, 2] + epsilon)
+        total += weight * residual * residual
+
+        scale = 2 * weight * residual / den
+        grad[0] += scale
+        grad[1] += scale * ki
+        grad[2] += scale * ki2
+        grad[3] -= scale * ki * model_value
+        grad[4] -= scale * ki2 * model_value
+    return total, grad
 
-def fit_model(x, y_mid, y_bid, y_ask, model):
+@njit(cache=True, fastmath=True)
+def _solve_cholesky_5x5(A, b):
     """
-    Fit the chosen volatility model to the market data using WLS method.
+    Solve the symmetric positive definite 5x5 system A x = b with a Cholesky factorization.
+
+    Args:
+        A (np.ndarray): Symmetric 5x5 matrix.
+        b (np.ndarray): Right-hand side of length 5.
+
+    Returns:
+        tuple: Contains:
+            - np.ndarray: The solution x (undefined when the factorization fails).
+            - bool: False if A is not positive definite.
+    """
+    L = np.zeros((5, 5))
+    for i in range(5):
+        for j in range(i + 1):
+            total = A[i, j]
+            for p in range(j):
+                total -= L[i, p] * L[j, p]
+            if i == j:
+                if total <= 0.0:
+                    return b, False
+                L[i, i] = np.sqrt(total)
+            else:
+                L[i, j] = total / L[j, j]
+
+    y = np.empty(5)
+    for i in range(5):
+        total = b[i]
+        for p in range(i):
+            total -= L[i, p] * y[p]
+        y[i] = total / L[i, i]
+
+    x = np.empty(5)
+    for i in range(4, -1, -1):
+        total = y[i]
+        for p in range(i + 1, 5):
+            total -= L[p, i] * x[p]
+        x[i] = total / L[i, i]
+    return x, True
+
+@njit(cache=True, fastmath=True)
+def _weighted_cost(params, k, y_mid, weights):
+    """
+    Weighted sum of squared RFV residuals.
+
+    Args:
+        params (np.ndarray): RFV model parameters [a, b, c, d, e] (float64).
+        k (array-like): Log-moneyness of the options.
+        y_mid (array-like): Mid prices of the options.
+        weights (array-like): Per-option residual weights.
+
+    Returns:
+        float: The weighted cost.
+    """
+    a, b, c, d, e = params
+    total = 0.0
+    for i in range(k.shape[0]):
+        residual = rfv_eval_scalar(k[i], a, b, c, d, e) - y_mid[i]
+        total += weights[i] * residual * residual
+    return total
+
+@njit(cache=True, fastmath=True)
+def _denominator_keeps_sign(d, e, k_min, k_max):
+    """
+    Check that the RFV denominator 1 + d*k + e*k^2 has no root on [k_min, k_max].
+
+    Args:
+        d, e (float): RFV denominator parameters.
+        k_min (float): Smallest log-moneyness of the chain.
+        k_max (float): Largest log-moneyness of the chain.
+
+    Returns:
+        bool: True if the denominator is strictly positive or strictly negative over the whole range.
+    """
+    low = 1 + k_min*(d + k_min*e)
+    high = 1 + k_max*(d + k_max*e)
+    if low * high <= 0:
+        return False
+    if e != 0:
+        vertex = -d / (2*e)
+        if k_min < vertex < k_max and low * (1 + vertex*(d + vertex*e)) <= 0:
+            return False
+    return True
+
+@njit(cache=True, fastmath=True)
+def fit_rfv_lm(k, y_mid, weights, initial_guess, max_iterations=50, tolerance=1e-12):
+    """
+    Fit the RFV model by weighted least squares using Levenberg-Marquardt.
+
+    Each iteration builds the 5x5 normal equations from the analytic Jacobian, solves the damped
+    system with a Cholesky factorization and adjusts the damping depending on whether the step
+    lowered the cost. Steps that move a pole of the model into the strike range are rejected.
+
+    Args:
+        k (array-like): Log-moneyness of the options.
+        y_mid (array-like): Mid prices of the options.
+        weights (array-like): Per-option residual weights.
+        initial_guess (np.ndarray): Starting parameters [a, b, c, d, e] (float64).
+        max_iterations (int, optional): Maximum number of accepted steps. Defaults to 50.
+        tolerance (float, optional): Relative cost decrease below which the fit has converged. Defaults to 1e-12.
+
+    Returns:
+        tuple: Contains:
+            - np.ndarray: The fitted model parameters.
+            - bool: True if the fit converged within max_iterations, False if it ran out of
+              iterations or no step lowered the cost.
+    """
+    params = initial_guess.copy()
+    cost = _weighted_cost(params, k, y_mid, weights)
+    damping = 1e-3
+    jtwj = np.empty((5, 5))
+    jtwr = np.empty(5)
+    row = np.empty(5)
+    k_min = k.min()
+    k_max = k.max()
+
+    for _ in range(max_iterations):
+        a, b, c, d, e = params
+        jtwj[:, :] = 0.0
+        jtwr[:] = 0.0
+        for i in range(k.shape[0]):
+            ki = k[i]
+            ki2 = ki * ki
+            den = 1 + d*ki + e*ki2
+            model_value = (a + b*ki + c*ki2) / den
+            residual = model_value - y_mid[i]
+            row[0] = 1 / den
+            row[1] = ki / den
+            row[2] = ki2 / den
+            row[3] = -ki * model_value / den
+            row[4] = -ki2 * model_value / den
+            for p in range(5):
+                weighted = weights[i] * row[p]
+                jtwr[p] -= weighted * residual
+                for s in range(p + 1):
+                    jtwj[p, s] += weighted * row[s]
+        for p in range(5):
+            for s in range(p):
+                jtwj[s, p] = jtwj[p, s]
+
+        improved = False
+        converged = False
+        while damping < 1e12:
+            system = jtwj.copy()
+            for p in range(5):
+                system[p, p] += damping * (1 + jtwj[p, p])
+            step, ok = _solve_cholesky_5x5(system, jtwr)
+            if ok and _denominator_keeps_sign(params[3] + step[3], params[4] + step[4], k_min, k_max):
+                candidate = params + step
+                candidate_cost = _weighted_cost(candidate, k, y_mid, weights)
+                if candidate_cost < cost:
+                    converged = cost - candidate_cost <= tolerance * (1 + cost)
+                    params = candidate
+                    cost = candidate_cost
+                    damping = max(damping * 0.3, 1e-12)
+                    improved = True
+                    break
+            damping *= 10
+
+        if not improved:
+            return params, False
+        if converged:
+            return params, True
+
+    return params, False
+
+def fit_model(x, y_mid, y_bid, y_ask):
+    """
+    Fit the RFV volatility model to the market data using WLS method.
+
+    Uses the jitted Levenberg-Marquardt solver. If it does not converge, L-BFGS-B is run from the
+    initial guess and the better of the two fits is returned.
 
     Args:
         x (array-like): Strikes of the options.
         y_mid (array-like): Mid prices of the options.
         y_bid (array-like): Bid prices of the options.
         y_ask (array-like): Ask prices of the options.
-        model (function): The volatility model to be fitted.
 
     Returns:
-        list: The fitted model parameters.
+        np.ndarray: The fitted model parameters.
     """
     k = np.log(x)
+    weights = 1 / (y_ask - y_bid + 1e-8)
+
+    initial_guess = np.array([0.2, 0.3, 0.1, 0.2, 0.1], dtype=np.float64)
+    params, converged = fit_rfv_lm(k, y_mid, weights, initial_guess)
+    if converged:
+        return params
 
-    initial_guess = [0.2, 0.3, 0.1, 0.2, 0.1]
     bounds = [(None, None), (None, None), (None, None), (None, None), (None, None)]
     
-    result = minimize(objective_function, initial_guess, args=(k, y_mid, y_bid, y_ask, model), method='L-BFGS-B', bounds=bounds)
-    return result.x
+    result = minimize(objective_and_grad, initial_guess, args=(pack_chain(k, y_mid, y_bid, y_ask),), method='L-BFGS-B', jac=True, bounds=bounds)
+    if result.fun < _weighted_cost(params, k, y_mid, weights):
+        return result.x
+    return params
@@ -1,11 +1,21 @@
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_TRUE_VALUES = frozenset(('true', '1', 'yes'))
+
+@lru_cache(maxsize=1)
 def load_env_file():
     """
     Load configuration from environment variables and validate them.
+
+    The environment is parsed once; later calls return the same read-only mapping.
+
+    Returns:
+        MappingProxyType: Read-only mapping of configuration keys to their parsed values.
     
     Raises:
         ValueError: If any required environment variable is not set.
@@ -16,7 +26,7 @@ def load_env_file():
         "SCHWAB_CALLBACK_URL": os.getenv('SCHWAB_CALLBACK_URL'),
         "SCHWAB_ACCOUNT_HASH": os.getenv('SCHWAB_ACCOUNT_HASH'),
         "FRED_API_KEY": os.getenv('FRED_API_KEY'),
-        "DRY_RUN": os.getenv('DRY_RUN', 'True').lower() in ['true', '1', 'yes'],
+        "DRY_RUN": os.getenv('DRY_RUN', 'True').lower() in _TRUE_VALUES,
         "TIME_TO_REST": int(os.getenv('TIME_TO_REST', 1)),
     }
 
@@ -24,4 +34,4 @@ def load_env_file():
         if value is None:
             raise ValueError(f"{key} environment variable not set")
     
-    return config
+    return MappingProxyType(config)
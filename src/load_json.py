@@ -20,6 +20,21 @@ class StockNode:
         to_entered_datetime (datetime or None): End time for entered datetime.
         next (StockNode or None): Pointer to the next node in the circular linked list.
     """
+
+    __slots__ = (
+        "ticker",
+        "date_index",
+        "option_type",
+        "min_overpriced",
+        "min_oi",
+        "q",
+        "trade_state",
+        "option_date",
+        "expiration_time",
+        "from_entered_datetime",
+        "to_entered_datetime",
+        "next",
+    )
     
     def __init__(self, ticker, date_index, option_type, min_overpriced, min_oi):
         """
@@ -111,11 +126,15 @@ class CircularLinkedList:
     
     Attributes:
         head (StockNode or None): Head node of the circular linked list.
+        tail (StockNode or None): Tail node of the circular linked list, whose next is head.
     """
+
+    __slots__ = ("head", "tail")
     
     def __init__(self):
         """Initializes an empty CircularLinkedList."""
         self.head = None
+        self.tail = None
 
     def append(self, stock_data):
         """
@@ -127,13 +146,24 @@ class CircularLinkedList:
         new_node = StockNode(**stock_data)
         if not self.head:
             self.head = new_node
-            new_node.next = self.head
         else:
-            current = self.head
-            while current.next != self.head:
-                current = current.next
-            current.next = new_node
-            new_node.next = self.head
+            self.tail.next = new_node
+        new_node.next = self.head
+        self.tail = new_node
+
+    def __iter__(self):
+        """
+        Iterates over the nodes once, starting from the head.
+
+        Yields:
+            StockNode: Each node in the circular linked list.
+        """
+        current_node = self.head
+        while current_node is not None:
+            yield current_node
+            current_node = current_node.next
+            if current_node is self.head:
+                break
 
 def load_json_file(filename):
     """
@@ -1,36 +1,33 @@
 import numpy as np
-from math import log, sqrt, exp
+from math import log, sqrt, exp, pi
 from numba import njit
 
-@njit
-def calculate_delta(S, K, T, r, sigma, q=0.0, option_type='calls'):
+_INV_SQRT2 = 0.7071067811865476
+_INV_SQRT_2PI = 0.3989422804014327
+
+@njit(inline='always')
+def _delta_given_type(S, K, T, r, sigma, q, is_call):
     """
-    Calculate the delta of an option using the Black-Scholes formula with custom normal_cdf and dividend yield.
+    Black-Scholes delta for a validated option type.
 
-    Parameters:
-    - S (float): Current stock price.
-    - K (float): Strike price.
-    - T (float): Time to maturity (in years).
-    - r (float): Risk-free interest rate (as a decimal).
-    - sigma (float): Volatility of the underlying asset.
-    - q (float, optional): Continuous dividend yield.
-    - option_type (str, optional): 'calls' or 'puts'.
+    Args:
+        S (float): Current stock price.
+        K (float): Strike price.
+        T (float): Time to maturity (in years).
+        r (float): Risk-free interest rate (as a decimal).
+        sigma (float): Volatility of the underlying asset.
+        q (float): Continuous dividend yield.
+        is_call (bool): True for calls, False for puts.
 
     Returns:
-    - float: The delta of the option.
+        float: The delta of the option.
     """
-    d1 = (log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * sqrt(T))
+    d1 = (log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * sqrt(T))
+    if is_call:
+        return normal_cdf(d1)
+    return normal_cdf(d1) - 1
 
-    if option_type == 'calls':
-        delta = normal_cdf(d1)
-    elif option_type == 'puts':
-        delta = normal_cdf(d1) - 1
-    else:
-        raise ValueError("option_type must be 'calls' or 'puts'.")
-
-    return delta
-
-@njit
+@njit(inline='always')
 def erf(x):
     """
     Approximation of the error function (erf) using a high-precision method.
@@ -54,11 +51,11 @@ def erf(x):
     x = abs(x)
     
     t = 1.0 / (1.0 + p * x)
-    y = 1.0 - (((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t * np.exp(-x * x))
+    y = 1.0 - (((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t * exp(-x * x))
 
     return sign * y
 
-@njit
+@njit(inline='always')
 def normal_cdf(x):
     """
     Approximation of the cumulative distribution function (CDF) for a standard normal distribution.
@@ -69,34 +66,40 @@ def normal_cdf(x):
     Returns:
     - float: The CDF value.
     """
-    return 0.5 * (1.0 + erf(x / np.sqrt(2.0)))
+    return 0.5 * (1.0 + erf(x * _INV_SQRT2))
 
-@njit
-def barone_adesi_whaley_american_option_price(S, K, T, r, sigma, q=0.0, option_type='calls'):
+@njit(inline='always')
+def _baw_price_given_sigma(sigma, S, K, T, r, q, is_call, exp_rT, exp_qT, sqrt_T, log_SK, r_minus_q):
     """
-    Calculate the price of an American option using the Barone-Adesi Whaley model with dividends.
+    Barone-Adesi Whaley price for a given volatility, using precomputed sigma-independent terms.
 
     Args:
+        sigma (float): Implied volatility.
         S (float): Current stock price.
         K (float): Strike price of the option.
         T (float): Time to expiration in years.
         r (float): Risk-free interest rate.
-        sigma (float): Implied volatility.
-        q (float, optional): Continuous dividend yield. Defaults to 0.0.
-        option_type (str, optional): Type of option ('calls' or 'puts'). Defaults to 'calls'.
+        q (float): Continuous dividend yield.
+        is_call (bool): True for calls, False for puts.
+        exp_rT (float): Precomputed exp(-r * T).
+        exp_qT (float): Precomputed exp(-q * T).
+        sqrt_T (float): Precomputed sqrt(T).
+        log_SK (float): Precomputed log(S / K).
+        r_minus_q (float): Precomputed r - q.
 
     Returns:
         float: The calculated option price.
     """
-    M = 2 * (r - q) / sigma**2
-    n = 2 * (r - q - 0.5 * sigma**2) / sigma**2
-    q2 = (-(n - 1) - sqrt((n - 1)**2 + 4 * M)) / 2
+    variance = sigma * sigma
+    M = 2 * r_minus_q / variance
+    n_minus_1 = 2 * (r_minus_q - 0.5 * variance) / variance - 1
+    q2 = (-n_minus_1 - sqrt(n_minus_1 * n_minus_1 + 4 * M)) / 2
     
-    d1 = (log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * sqrt(T))
-    d2 = d1 - sigma * sqrt(T)
+    d1 = (log_SK + (r_minus_q + 0.5 * variance) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
     
-    if option_type == 'calls':
-        european_price = S * exp(-q * T) * normal_cdf(d1) - K * exp(-r * T) * normal_cdf(d2)
+    if is_call:
+        european_price = S * exp_qT * normal_cdf(d1) - K * exp_rT * normal_cdf(d2)
         if q >= r:
             return european_price
         if q2 < 0:
@@ -107,9 +110,8 @@ def barone_adesi_whaley_american_option_price(S, K, T, r, sigma, q=0.0, option_t
         else:
             A2 = (S_critical - K) * (S_critical**-q2)
             return european_price + A2 * (S / S_critical)**q2
-    
-    elif option_type == 'puts':
-        european_price = K * exp(-r * T) * normal_cdf(-d2) - S * exp(-q * T) * normal_cdf(-d1)
+    else:
+        european_price = K * exp_rT * normal_cdf(-d2) - S * exp_qT * normal_cdf(-d1)
         if q >= r:
             return european_price
         if q2 < 0:
@@ -120,45 +122,161 @@ def barone_adesi_whaley_american_option_price(S, K, T, r, sigma, q=0.0, option_t
         else:
             A2 = (K - S_critical) * (S_critical**-q2)
             return european_price + A2 * (S / S_critical)**q2
-    
-    else:
+
+@njit(cache=True)
+def barone_adesi_whaley_american_option_price(S, K, T, r, sigma, q=0.0, option_type='calls'):
+    """
+    Calculate the price of an American option using the Barone-Adesi Whaley model with dividends.
+
+    Args:
+        S (float): Current stock price.
+        K (float): Strike price of the option.
+        T (float): Time to expiration in years.
+        r (float): Risk-free interest rate.
+        sigma (float): Implied volatility.
+        q (float, optional): Continuous dividend yield. Defaults to 0.0.
+        option_type (str, optional): Type of option ('calls' or 'puts'). Defaults to 'calls'.
+
+    Returns:
+        float: The calculated option price.
+    """
+    if option_type != 'calls' and option_type != 'puts':
         raise ValueError("option_type must be 'calls' or 'puts'.")
 
-@njit
-def calculate_implied_volatility_baw(option_price, S, K, r, T, q=0.0, option_type='calls', max_iterations=100, tolerance=1e-8):
+    return _baw_price_given_sigma(sigma, S, K, T, r, q, option_type == 'calls', exp(-r * T), exp(-q * T), sqrt(T), log(S / K), r - q)
+
+@njit(inline='always')
+def _implied_volatility_given_type(option_price, S, K, r, T, q, is_call, max_iterations, tolerance):
     """
-    Calculate the implied volatility using the Barone-Adesi Whaley model with dividends.
+    Barone-Adesi Whaley implied volatility for a validated option type.
 
-    Parameters:
-    - option_price (float): Observed option price (mid-price).
-    - S (float): Current stock price.
-    - K (float): Strike price of the option.
-    - r (float): Risk-free interest rate.
-    - T (float): Time to expiration in years.
-    - q (float, optional): Continuous dividend yield. Defaults to 0.0.
-    - option_type (str, optional): Type of option ('calls' or 'puts'). Defaults to 'calls'.
-    - max_iterations (int, optional): Maximum number of iterations for the bisection method. Defaults to 100.
-    - tolerance (float, optional): Convergence tolerance. Defaults to 1e-8.
+    Args:
+        option_price (float): Observed option price (mid-price).
+        S (float): Current stock price.
+        K (float): Strike price of the option.
+        r (float): Risk-free interest rate.
+        T (float): Time to expiration in years.
+        q (float): Continuous dividend yield.
+        is_call (bool): True for calls, False for puts.
+        max_iterations (int): Maximum number of root-finding iterations.
+        tolerance (float): Convergence tolerance.
 
     Returns:
-    - float: The implied volatility.
+        float: The implied volatility.
     """
+    exp_rT = exp(-r * T)
+    exp_qT = exp(-q * T)
+    sqrt_T = sqrt(T)
+    log_SK = log(S / K)
+    r_minus_q = r - q
+
     lower_vol = 1e-5
     upper_vol = 10.0
 
+    # No-arbitrage bounds: prices outside them have no solution, so the search would only collapse onto an end of the bracket.
+    if is_call:
+        lower_bound = max(S * exp_qT - K * exp_rT, 0.0)
+        if S > K:
+            lower_bound = min(lower_bound, S - K)
+        upper_bound = S
+    else:
+        lower_bound = max(K * exp_rT - S * exp_qT, 0.0)
+        if S < K:
+            lower_bound = min(lower_bound, K - S)
+        upper_bound = K
+
+    if option_price <= lower_bound:
+        return lower_vol
+    if option_price >= upper_bound:
+        return upper_vol
+
+    # Corrado-Miller estimate on the European call (puts through parity) as the starting point.
+    forward_S = S * exp_qT
+    discounted_K = K * exp_rT
+    call_price = option_price if is_call else option_price + forward_S - discounted_K
+    half_moneyness = 0.5 * (forward_S - discounted_K)
+    skew = call_price - half_moneyness
+    radicand = skew * skew - 2 * half_moneyness * half_moneyness / pi
+    sigma = sqrt(2 * pi / T) / (forward_S + discounted_K) * (skew + sqrt(max(radicand, 0.0)))
+    if not lower_vol < sigma < upper_vol:
+        sigma = (lower_vol + upper_vol) / 2
+
+    # Newton steps on the European vega, kept inside the bisection bracket and replaced by a
+    # bisection step whenever they leave it or stop shrinking fast enough.
+    step = previous_step = upper_vol - lower_vol
     for i in range(max_iterations):
-        mid_vol = (lower_vol + upper_vol) / 2
-        price = barone_adesi_whaley_american_option_price(S, K, T, r, mid_vol, q, option_type)
+        price = _baw_price_given_sigma(sigma, S, K, T, r, q, is_call, exp_rT, exp_qT, sqrt_T, log_SK, r_minus_q)
+        price_error = price - option_price
 
-        if abs(price - option_price) < tolerance:
-            return mid_vol
+        if abs(price_error) < tolerance:
+            return sigma
 
-        if price > option_price:
-            upper_vol = mid_vol
+        if price_error > 0:
+            upper_vol = sigma
         else:
-            lower_vol = mid_vol
+            lower_vol = sigma
 
         if upper_vol - lower_vol < tolerance:
             break
 
-    return mid_vol
+        d1 = (log_SK + (r_minus_q + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+        vega = forward_S * sqrt_T * exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+        previous_step, newton_step = step, price_error / vega if vega > 0.0 else upper_vol
+        if lower_vol < sigma - newton_step < upper_vol and 2 * abs(newton_step) <= abs(previous_step):
+            step = newton_step
+            sigma -= newton_step
+        else:
+            step = 0.5 * (upper_vol - lower_vol)
+            sigma = lower_vol + step
+
+    return sigma
+
+@njit(cache=True, nogil=True)
+def calculate_implied_volatilities_baw(option_prices, S, K, r, T, q, is_call, max_iterations=100, tolerance=1e-8):
+    """
+    Calculate Barone-Adesi Whaley implied volatilities for a batch of options on the same underlying.
+
+    Parameters:
+    - option_prices (np.ndarray): Observed option prices (mid-prices).
+    - S (float): Current stock price.
+    - K (np.ndarray): Strike prices aligned with option_prices.
+    - r (float): Risk-free interest rate.
+    - T (float): Time to expiration in years.
+    - q (float): Continuous dividend yield.
+    - is_call (np.ndarray): Boolean array, True for calls and False for puts.
+    - max_iterations (int, optional): Maximum number of root-finding iterations. Defaults to 100.
+    - tolerance (float, optional): Convergence tolerance. Defaults to 1e-8.
+
+    Returns:
+    - np.ndarray: The implied volatilities.
+    """
+    sigmas = np.empty(option_prices.shape[0])
+    for i in range(option_prices.shape[0]):
+        sigmas[i] = _implied_volatility_given_type(option_prices[i], S, K[i], r, T, q, is_call[i], max_iterations, tolerance)
+    return sigmas
+
+@njit(cache=True, nogil=True)
+def calculate_implied_volatilities_and_deltas_baw(option_prices, S, K, r, T, q, is_call, max_iterations=100, tolerance=1e-8):
+    """
+    Calculate Barone-Adesi Whaley implied volatilities and the matching Black-Scholes deltas in one pass.
+
+    Parameters:
+    - option_prices (np.ndarray): Observed option prices (mid-prices).
+    - S (float): Current stock price.
+    - K (np.ndarray): Strike prices aligned with option_prices.
+    - r (float): Risk-free interest rate.
+    - T (float): Time to expiration in years.
+    - q (float): Continuous dividend yield.
+    - is_call (np.ndarray): Boolean array, True for calls and False for puts.
+    - max_iterations (int, optional): Maximum number of root-finding iterations. Defaults to 100.
+    - tolerance (float, optional): Convergence tolerance. Defaults to 1e-8.
+
+    Returns:
+    - tuple: The implied volatilities and the deltas, as two np.ndarray.
+    """
+    sigmas = np.empty(option_prices.shape[0])
+    deltas = np.empty(option_prices.shape[0])
+    for i in range(option_prices.shape[0]):
+        sigmas[i] = _implied_volatility_given_type(option_prices[i], S, K[i], r, T, q, is_call[i], max_iterations, tolerance)
+        deltas[i] = _delta_given_type(S, K[i], T, r, sigmas[i], q, is_call[i])
+    return sigmas, deltas
@@ -1,13 +1,84 @@
-from collections import defaultdict
+import asyncio
 from datetime import datetime
+from functools import lru_cache
 import logging
 import math
+import numpy as np
+from time import monotonic
 from schwab.orders.equities import equity_buy_market, equity_sell_short_market, equity_sell_market, equity_buy_to_cover_market
 from schwab.orders.options import OptionSymbol, option_sell_to_open_limit
 
-from src.models import calculate_delta, calculate_implied_volatility_baw
+from src.models import calculate_implied_volatilities_and_deltas_baw
 from src.client_manager import ClientManager
 
+_CHAIN_KEY = {"calls": "callExpDateMap", "puts": "putExpDateMap"}
+_QUOTE_TTL = 1.0
+_GREEKS_MAX_S_MOVE = 1e-3
+_GREEKS_MAX_PRICE_MOVE = 1e-4
+_GREEKS_MAX_T_DRIFT = 60 / (365 * 24 * 3600)
+_EQUITY_ORDER_BUILDERS = {
+    (True, False): equity_sell_short_market,
+    (True, True): equity_sell_market,
+    (False, False): equity_buy_market,
+    (False, True): equity_buy_to_cover_market,
+}
+
+@lru_cache(maxsize=4096)
+def _build_option_symbol(ticker, option_date, contract_type, strike):
+    """
+    Build the Schwab option symbol for a contract, caching the formatted result.
+
+    Args:
+        ticker (str): The ticker symbol of the underlying security.
+        option_date (datetime.date): The expiration date of the option contract.
+        contract_type (str): 'C' for calls or 'P' for puts.
+        strike (str): The strike price of the option contract.
+
+    Returns:
+        str: The option symbol.
+    """
+    return OptionSymbol(ticker, option_date, contract_type, strike).build()
+
+class OptionChainArrays:
+    """
+    Option chain for one expiration and contract type, stored as parallel arrays sorted by strike.
+
+    Attributes:
+        strikes (np.ndarray): Strike prices in ascending order (float64).
+        bid (np.ndarray): Bid prices aligned with strikes (float64).
+        ask (np.ndarray): Ask prices aligned with strikes (float64).
+        mid (np.ndarray): Mid prices rounded to 3 decimals, aligned with strikes (float64).
+        open_interest (np.ndarray): Open interest aligned with strikes (float64).
+    """
+
+    __slots__ = ("strikes", "bid", "ask", "mid", "open_interest")
+
+    def __init__(self, strikes, bid, ask, mid, open_interest):
+        """
+        Initializes an OptionChainArrays instance.
+
+        Args:
+            strikes (np.ndarray): Strike prices in ascending order.
+            bid (np.ndarray): Bid prices aligned with strikes.
+            ask (np.ndarray): Ask prices aligned with strikes.
+            mid (np.ndarray): Mid prices aligned with strikes.
+            open_interest (np.ndarray): Open interest aligned with strikes.
+        """
+        self.strikes = strikes
+        self.bid = bid
+        self.ask = ask
+        self.mid = mid
+        self.open_interest = open_interest
+
+    def __len__(self):
+        """
+        Returns the number of strikes in the chain.
+
+        Returns:
+            int: Number of strikes.
+        """
+        return self.strikes.shape[0]
+
 class SchwabManager:
     """
     A manager class that handles various operations with the Schwab API, such as fetching account positions, 
@@ -19,6 +90,8 @@ class SchwabManager:
 
     Methods:
         initialize(): Authenticates the Schwab client and fetches account numbers.
+        close(): Closes the Schwab client session.
+        get_quote(ticker): Fetches the quote for a ticker, reusing a recent response.
         get_option_expiration_date(ticker, date_index): Fetches the option expiration date for a given ticker and index.
         get_dividend_yield(ticker): Fetches and parses the dividend yield for a given ticker.
         cancel_existing_orders(ticker, from_date, to_date): Cancels existing orders for a specified ticker within a date range.
@@ -39,6 +112,10 @@ class SchwabManager:
         """
         self.config = config
         self.client_manager = ClientManager(config)
+        self._quote_cache = {}
+        self._pending_quotes = {}
+        self._quote_flush_task = None
+        self._greeks_cache = {}
 
     async def initialize(self):
         """
@@ -47,6 +124,56 @@ class SchwabManager:
         await self.client_manager.authenticate_schwab_client()
         logging.getLogger().custom(await self.client_manager.fetch_account_numbers())
 
+    async def close(self):
+        """
+        Close the Schwab client session.
+        """
+        await self.client_manager.close()
+
+    async def get_quote(self, ticker):
+        """
+        Fetch the quote for a ticker, reusing a response fetched less than _QUOTE_TTL seconds ago.
+
+        Requests for tickers that are not cached are coalesced: every call made before the event loop
+        next runs joins the same pending batch, which is fetched with a single quotes request.
+
+        Args:
+            ticker (str): The ticker symbol of the underlying security.
+
+        Returns:
+            dict: The quote data if successful, None otherwise.
+        """
+        cached = self._quote_cache.get(ticker)
+        if cached is not None and monotonic() - cached[0] < _QUOTE_TTL:
+            return cached[1]
+
+        future = self._pending_quotes.get(ticker)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_quotes[ticker] = future
+            if len(self._pending_quotes) == 1:
+                self._quote_flush_task = asyncio.create_task(self._flush_pending_quotes())
+        return await asyncio.shield(future)
+
+    async def _flush_pending_quotes(self):
+        """
+        Fetch all pending quote requests with one quotes request and resolve their futures.
+        """
+        await asyncio.sleep(0)
+        pending, self._pending_quotes = self._pending_quotes, {}
+
+        quote_data = None
+        try:
+            quote_data = await self.client_manager.fetch_quotes(list(pending))
+        finally:
+            now = monotonic()
+            for ticker, future in pending.items():
+                result = {ticker: quote_data[ticker]} if quote_data and ticker in quote_data else None
+                if result is not None:
+                    self._quote_cache[ticker] = (now, result)
+                if not future.done():
+                    future.set_result(result)
+
     async def get_option_expiration_date(self, ticker, date_index):
         """
         Fetch the option expiration date for a given ticker and index.
@@ -77,7 +204,7 @@ class SchwabManager:
         Returns:
             float: The dividend yield as a decimal (e.g., 0.02 for 2%), or None if an error occurs.
         """
-        div_data = await self.client_manager.fetch_quote(ticker)
+        div_data = await self.get_quote(ticker)
         
         if div_data and ticker in div_data:
             try:
@@ -106,14 +233,18 @@ class SchwabManager:
         if not order_data:
             return
 
+        order_ids = []
         for order in order_data:
-            asset_type = order["orderLegCollection"][0]["instrument"]["assetType"]
-            order_id = order["orderId"]
+            instrument = order["orderLegCollection"][0]["instrument"]
+            asset_type = instrument["assetType"]
 
-            if asset_type == "EQUITY" and order["orderLegCollection"][0]["instrument"]["symbol"] == ticker:
-                await self.client_manager.cancel_order(order_id, self.config["SCHWAB_ACCOUNT_HASH"])
-            elif asset_type == "OPTION" and order["orderLegCollection"][0]["instrument"]["underlyingSymbol"] == ticker:
-                await self.client_manager.cancel_order(order_id, self.config["SCHWAB_ACCOUNT_HASH"])
+            if asset_type == "EQUITY" and instrument["symbol"] == ticker:
+                order_ids.append(order["orderId"])
+            elif asset_type == "OPTION" and instrument["underlyingSymbol"] == ticker:
+                order_ids.append(order["orderId"])
+
+        account_hash = self.config["SCHWAB_ACCOUNT_HASH"]
+        await asyncio.gather(*(self.client_manager.cancel_order(order_id, account_hash) for order_id in order_ids))
 
     async def get_account_positions(self, ticker):
         """
@@ -125,30 +256,27 @@ class SchwabManager:
         Returns:
             tuple: Contains:
                 - streamers_tickers (list): List of option ticker symbols.
-                - options (dict): Dictionary of options positions.
+                - options (dict): Net option quantities (long minus short) keyed by option symbol.
                 - total_shares (int): Total number of shares held for the ticker.
         """
         account_data = await self.client_manager.fetch_account_data(self.config["SCHWAB_ACCOUNT_HASH"])
         if not account_data:
             return [], {}, 0
 
-        streamers_tickers = [
-            position["instrument"]["symbol"]
-            for position in account_data["securitiesAccount"].get("positions", [])
-            if position["instrument"]["assetType"] == "OPTION" and position["instrument"]["underlyingSymbol"] == ticker
-        ]
-
-        options = {
-            position["instrument"]["symbol"]: position
-            for position in account_data["securitiesAccount"].get("positions", [])
-            if position["instrument"]["assetType"] == "OPTION" and position["instrument"]["underlyingSymbol"] == ticker
-        }
-
-        total_shares = sum(
-            round(float(position["longQuantity"]) - float(position["shortQuantity"]))
-            for position in account_data["securitiesAccount"].get("positions", [])
-            if position["instrument"]["assetType"] == "EQUITY" and position["instrument"]["symbol"] == ticker
-        )
+        streamers_tickers = []
+        options = {}
+        total_shares = 0
+
+        for position in account_data.get("securitiesAccount", {}).get("positions", ()):
+            instrument = position["instrument"]
+            asset_type = instrument["assetType"]
+            symbol = instrument["symbol"]
+
+            if asset_type == "OPTION" and instrument["underlyingSymbol"] == ticker:
+                streamers_tickers.append(symbol)
+                options[symbol] = float(position["longQuantity"]) - float(position["shortQuantity"])
+            elif asset_type == "EQUITY" and symbol == ticker:
+                total_shares += round(float(position["longQuantity"]) - float(position["shortQuantity"]))
 
         return streamers_tickers, options, total_shares
 
@@ -156,11 +284,16 @@ class SchwabManager:
         """
         Fetch streamer quotes and calculate delta values for options on the specified ticker.
 
+        Implied volatilities and deltas are reused per contract while the underlying price, the option
+        price and the time to expiration have not moved since they were last computed. The remaining
+        contracts are solved in a worker thread, so the event loop keeps serving pending requests. The
+        cache for the ticker is replaced on every call, so contracts no longer held are dropped.
+
         Args:
             ticker (str): The ticker symbol of the underlying security.
             streamers_tickers (list): A list of option ticker symbols.
             expiration_time (datetime): The expiration time of the options.
-            options (dict): Dictionary of options positions.
+            options (dict): Net option quantities keyed by option symbol.
             total_shares (int): The total number of shares held for the ticker.
             r (float): The risk-free rate.
             q (float): The dividend yield.
@@ -171,34 +304,53 @@ class SchwabManager:
                 - delta_imbalance (float): Calculated delta imbalance.
         """
         total_deltas = 0.0
-        enable_hedge = False
 
-        stock_quote_data = await self.client_manager.fetch_quote(ticker)
-        if not stock_quote_data:
+        stock_quote_data, options_quote_data = await asyncio.gather(
+            self.get_quote(ticker),
+            self.client_manager.fetch_quotes(streamers_tickers)
+        )
+        if not stock_quote_data or not options_quote_data:
             return total_deltas, 0
 
         S = round((stock_quote_data[ticker]['quote']['bidPrice'] + stock_quote_data[ticker]['quote']['askPrice']) / 2, 3)
 
-        options_quote_data = await self.client_manager.fetch_quotes(streamers_tickers)
-        if not options_quote_data:
-            return total_deltas, 0
-
-        current_time = datetime.now()
-
-        for quote in options_quote_data:
-            price = (options_quote_data[quote]["quote"]["bidPrice"] + options_quote_data[quote]["quote"]["askPrice"]) / 2
-            T = (expiration_time - current_time).total_seconds() / (365 * 24 * 3600)
-            K = float(options_quote_data[quote]['reference']['strikePrice'])
-            option_type = 'calls' if options_quote_data[quote]['reference']['contractType'] == 'C' else 'puts'
-
-            sigma = calculate_implied_volatility_baw(price, S, K, r, T, q=q, option_type=option_type)
-            delta = calculate_delta(S, K, T, r, sigma, q=q, option_type=option_type)
-
-            if sigma > 0.005:
-                enable_hedge = True
+        T = (expiration_time - datetime.now()).total_seconds() / (365 * 24 * 3600)
+
+        num_options = len(options_quote_data)
+        symbols = []
+        prices = np.empty(num_options)
+        K = np.empty(num_options)
+        is_call = np.empty(num_options, dtype=np.bool_)
+        quantities = np.empty(num_options)
+        sigma = np.empty(num_options)
+        delta = np.empty(num_options)
+        stale = np.ones(num_options, dtype=np.bool_)
+        previous_greeks = self._greeks_cache.get(ticker, {})
+        greeks = {}
+        for i, (quote, option_quote) in enumerate(options_quote_data.items()):
+            symbols.append(quote)
+            prices[i] = (option_quote["quote"]["bidPrice"] + option_quote["quote"]["askPrice"]) / 2
+            K[i] = option_quote['reference']['strikePrice']
+            is_call[i] = option_quote['reference']['contractType'] == 'C'
+            quantities[i] = options[quote]
+
+            cached = previous_greeks.get(quote)
+            if cached is not None and abs(S - cached[0]) < _GREEKS_MAX_S_MOVE and abs(prices[i] - cached[1]) < _GREEKS_MAX_PRICE_MOVE and abs(T - cached[2]) < _GREEKS_MAX_T_DRIFT:
+                sigma[i] = cached[3]
+                delta[i] = cached[4]
+                stale[i] = False
+                greeks[quote] = cached
+
+        if stale.any():
+            sigma[stale], delta[stale] = await asyncio.to_thread(
+                calculate_implied_volatilities_and_deltas_baw, prices[stale], S, K[stale], r, T, q, is_call[stale]
+            )
+            for i in np.flatnonzero(stale):
+                greeks[symbols[i]] = (S, prices[i], T, sigma[i], delta[i])
+        self._greeks_cache[ticker] = greeks
 
-            quantity = float(options[quote]["longQuantity"]) - float(options[quote]["shortQuantity"])
-            total_deltas += (delta * quantity * 100.0)
+        enable_hedge = bool((sigma > 0.005).any())
+        total_deltas = float((delta * quantities * 100.0).sum())
 
         total_deltas = round(total_deltas)
         delta_imbalance = total_shares + total_deltas if enable_hedge else 0
@@ -214,29 +366,25 @@ class SchwabManager:
             delta_imbalance (float): The calculated delta imbalance that needs to be hedged.
             is_closing_position (bool, optional): If True, close the position rather than hedging.
 
+        Imbalances smaller than one share are ignored, since they would round down to an empty order.
+
         Returns:
             None
         """
-        if delta_imbalance > 0:
+        quantity = int(abs(delta_imbalance))
+        if quantity == 0:
+            return
+
+        go_short = delta_imbalance > 0
+        if go_short:
             logging.getLogger().custom(f"ADJUSTMENT NEEDED: Go short {delta_imbalance} shares.")
-            if not self.config["DRY_RUN"]:
-                if is_closing_position:
-                    order = equity_sell_market(ticker, int(delta_imbalance)).build()
-                else:
-                    order = equity_sell_short_market(ticker, int(delta_imbalance)).build()
-
-                logging.getLogger().custom(f"Placing order for -{delta_imbalance} shares...")
-                await self.client_manager.place_order(self.config["SCHWAB_ACCOUNT_HASH"], order)
         else:
             logging.getLogger().custom(f"ADJUSTMENT NEEDED: Go long {-1 * delta_imbalance} shares.")
-            if not self.config["DRY_RUN"]:
-                if is_closing_position:
-                    order = equity_buy_to_cover_market(ticker, int(-1 * delta_imbalance)).build()
-                else:
-                    order = equity_buy_market(ticker, int(-1 * delta_imbalance)).build()
 
-                logging.getLogger().custom(f"Placing order for +{-1 * delta_imbalance} shares...")
-                await self.client_manager.place_order(self.config["SCHWAB_ACCOUNT_HASH"], order)
+        if not self.config["DRY_RUN"]:
+            order = _EQUITY_ORDER_BUILDERS[(go_short, is_closing_position)](ticker, quantity).build()
+            logging.getLogger().custom(f"Placing order for {'-' if go_short else '+'}{quantity} shares...")
+            await self.client_manager.place_order(self.config["SCHWAB_ACCOUNT_HASH"], order)
 
     async def handle_delta_adjustments(self, ticker, streamers_tickers, expiration_time, options, total_shares, r, q):
         """
@@ -246,7 +394,7 @@ class SchwabManager:
             ticker (str): The ticker symbol of the underlying security.
             streamers_tickers (list): A list of option ticker symbols.
             expiration_time (datetime): The expiration time of the options.
-            options (dict): Dictionary of options positions.
+            options (dict): Net option quantities keyed by option symbol.
             total_shares (int): The total number of shares held for the ticker.
             r (float): The risk-free rate.
             q (float): The dividend yield.
@@ -277,40 +425,45 @@ class SchwabManager:
 
         Returns:
             tuple: Contains:
-                - quote_data (defaultdict): The quote data for each strike.
+                - chain_arrays (OptionChainArrays): The quotes of the chain, sorted by strike.
                 - S (float): The underlying stock price.
         """
-        quote_data = defaultdict(lambda: {"bid": None, "ask": None, "mid": None, "open_interest": None, "bid_IV": None, "ask_IV": None, "mid_IV": None})
         S = 0.0
-        chain_primary_key = "callExpDateMap" if option_type == "calls" else "putExpDateMap"
 
         chain = await self.client_manager.fetch_option_chain(ticker, option_date, option_type)
         if not chain:
-            return quote_data, S
+            return OptionChainArrays(*(np.empty(0) for _ in range(5))), S
 
         if chain.get("underlyingPrice") is not None:
             S = float(chain["underlyingPrice"])
 
-        chain_secondary_key = next(iter(chain[chain_primary_key].keys()))
-        for strike_price in chain[chain_primary_key][chain_secondary_key]:
-            option_json = chain[chain_primary_key][chain_secondary_key][strike_price][0]
+        expiration_map = chain[_CHAIN_KEY[option_type]]
+        strikes_map = expiration_map[next(iter(expiration_map))]
+
+        num_strikes = len(strikes_map)
+        strikes = np.empty(num_strikes)
+        bid = np.empty(num_strikes)
+        ask = np.empty(num_strikes)
+        mid = np.empty(num_strikes)
+        open_interest = np.empty(num_strikes)
+
+        count = 0
+        for strike_price, option_legs in strikes_map.items():
+            option_json = option_legs[0]
             bid_price = option_json["bid"]
             ask_price = option_json["ask"]
-            open_interest = option_json["openInterest"]
-
-            if strike_price is not None and bid_price is not None and ask_price is not None and open_interest is not None:
-                mid_price = round(float((bid_price + ask_price) / 2), 3)
-                quote_data[float(strike_price)] = {
-                    "bid": float(bid_price),
-                    "ask": float(ask_price),
-                    "mid": float(mid_price),
-                    "open_interest": float(open_interest),
-                    "bid_IV": 0.0,
-                    "ask_IV": 0.0,
-                    "mid_IV": 0.0
-                }
-
-        return quote_data, S
+            strike_open_interest = option_json["openInterest"]
+
+            if bid_price is not None and ask_price is not None and strike_open_interest is not None:
+                strikes[count] = float(strike_price)
+                bid[count] = bid_price
+                ask[count] = ask_price
+                mid[count] = round((bid_price + ask_price) / 2, 3)
+                open_interest[count] = strike_open_interest
+                count += 1
+
+        order = np.argsort(strikes[:count], kind='stable')
+        return OptionChainArrays(strikes[order], bid[order], ask[order], mid[order], open_interest[order]), S
 
     async def sell_option(self, ticker, option_type, option_date, strike, mid_price, best_mispricing, best_bid_price, best_ask_price, best_open_interest):
         """
@@ -331,8 +484,7 @@ class SchwabManager:
         mid_price_floored = math.floor((mid_price_ceiled - 0.05) * 100) / 100
         
         contract_type = 'C' if option_type == 'calls' else 'P'
-        symbol = OptionSymbol(
-            ticker, option_date, contract_type, str(strike)).build()
+        symbol = _build_option_symbol(ticker, option_date, contract_type, str(strike))
 
         logging.getLogger().custom(f"Go short {symbol} at LIMIT {mid_price_floored} with mispricing: {best_mispricing} strike: {strike} oi: {best_open_interest} bid: {best_bid_price} ask: {best_ask_price}.")
         if not self.config["DRY_RUN"]:
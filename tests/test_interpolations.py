@@ -0,0 +1,37 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src import interpolations
+
+
+class FitModelTest(unittest.TestCase):
+    def setUp(self):
+        self.x = np.linspace(80.0, 120.0, 25)
+        self.k = np.log(self.x)
+        # Sharp spike at K=101: a rational fit can only follow it by moving a pole into the strike range.
+        self.y_mid = 0.2 + 0.002 / np.abs(self.k - np.log(101.0))
+        self.y_bid = self.y_mid - 0.01
+        self.y_ask = self.y_mid + 0.01
+        self.weights = 1 / (self.y_ask - self.y_bid + 1e-8)
+        self.initial_guess = np.array([0.2, 0.3, 0.1, 0.2, 0.1])
+
+    def test_lm_keeps_denominator_sign_and_reports_failure_on_pole_prone_smile(self):
+        params, converged = interpolations.fit_rfv_lm(self.k, self.y_mid, self.weights, self.initial_guess)
+
+        self.assertFalse(converged)
+        self.assertTrue(interpolations._denominator_keeps_sign(params[3], params[4], self.k.min(), self.k.max()))
+
+    def test_fit_model_falls_back_to_lbfgsb_on_pole_prone_smile(self):
+        with mock.patch.object(interpolations, "minimize", wraps=interpolations.minimize) as minimize:
+            params = interpolations.fit_model(self.x, self.y_mid, self.y_bid, self.y_ask)
+
+        minimize.assert_called_once()
+        lm_params, _ = interpolations.fit_rfv_lm(self.k, self.y_mid, self.weights, self.initial_guess)
+        cost = interpolations._weighted_cost(params, self.k, self.y_mid, self.weights)
+        self.assertLessEqual(cost, interpolations._weighted_cost(lm_params, self.k, self.y_mid, self.weights))
+
+
+if __name__ == "__main__":
+    unittest.main()